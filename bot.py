@@ -12,11 +12,13 @@ from aiogram.fsm.state import State, StatesGroup
 
 from data import format_film_details
 from external import async_log_function_call
-from keyboards import build_films_keyboard, genre_keyboard, build_favorites_keyboard
+from keyboards import build_films_keyboard, genre_keyboard, build_favorites_keyboard, get_film_id
 from commands import setup_commands
+from middlewares import CallbackThrottleMiddleware
 from config import TOKEN
 
 ITEMS_PER_PAGE = 5
+MAX_CALLBACKS_PER_USER = 2
 API_URL = "https://api.imdbapi.dev/titles"
 SEARCH_API_URL = "https://api.imdbapi.dev/search/titles"
 FAVS_DIR = Path("UserFavorites")
@@ -24,6 +26,7 @@ FAVS_DIR.mkdir(exist_ok=True)
 
 bot = Bot(token=TOKEN)
 dp = Dispatcher()
+dp.callback_query.outer_middleware(CallbackThrottleMiddleware(MAX_CALLBACKS_PER_USER))
 
 class FilmStates(StatesGroup):
     waiting_for_query = State()
@@ -100,21 +103,12 @@ async def show_popular(message: types.Message, state: FSMContext):
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(API_URL, params=params_movie) as resp_movie:
-                data_movie = await resp_movie.json()
-            async with session.get(API_URL, params=params_series) as resp_series:
-                data_series = await resp_series.json()
-
-        films = data_movie.get("titles", []) + data_series.get("titles", [])
+        films = await stream_films_page(message, state, [params_movie, params_series])
 
         if not films:
             await message.answer("Не вдалося завантажити фільми")
             return
 
-        await state.update_data(items=films, page=1)
-        await send_films_page(message, films, 1)
-
     except Exception as e:
         logging.error(f"Помилка при завантаженні популярних фільмів: {str(e)}", exc_info=True)
         await message.answer("Сталася помилка при завантаженні фільмів")
@@ -203,26 +197,15 @@ async def process_query(message: types.Message, state: FSMContext):
 async def process_genre(callback: types.CallbackQuery, state: FSMContext):
     genre = callback.data.split("_", 1)[1]
 
-    params = {
-        "types": "MOVIE",
-        "types": "TV_SERIES",
-        "genres": genre,
-        "sortBy": "SORT_BY_POPULARITY",
-    }
+    sources = genre_sources(genre)
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(API_URL, params=params) as resp:
-                data = await resp.json()
-                films = data.get("titles", [])
+        films = await stream_films_page(callback.message, state, sources)
 
         if not films:
             await callback.message.answer(f"Не знайдено фільмів жанру: {genre}")
             return
 
-        await state.update_data(items=films, page=1)
-        await send_films_page(callback.message, films, 1)
-
     except Exception as e:
         logging.error(f"Помилка при пошуку за жанром {genre}: {str(e)}", exc_info=True)
         await callback.message.answer("Сталася помилка при пошуку за жанром.")
@@ -242,25 +225,14 @@ async def manual_genre_input(callback: types.CallbackQuery, state: FSMContext):
 async def process_manual_genre(message: types.Message, state: FSMContext):
     genre = message.text.strip().title()
 
-    params = {
-        "types": "MOVIE",
-        "types": "TV_SERIES",
-        "genres": genre,
-        "sortBy": "SORT_BY_POPULARITY",
-    }
+    sources = genre_sources(genre)
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(API_URL, params=params) as resp:
-                data = await resp.json()
-                films = data.get("titles", [])
+        films = await stream_films_page(message, state, sources)
 
         if not films:
             await message.answer(f"Не знайдено фільмів жанру: {genre}")
             return
 
-        await state.update_data(items=films, page=1)
-        await send_films_page(message, films, 1)
-
     except Exception as e:
         logging.error(f"Помилка при ручному пошуку жанру {genre}: {str(e)}", exc_info=True)
         await message.answer("Сталася помилка при пошуку за жанром.")
@@ -268,19 +240,107 @@ async def process_manual_genre(message: types.Message, state: FSMContext):
     await state.clear()
 
 # Сторінки популярних / пошуку
-@async_log_function_call
-async def send_films_page(chat, films, page):
+def build_films_page(films, page, show_nav=True):
     start = (page - 1) * ITEMS_PER_PAGE
     end = start + ITEMS_PER_PAGE
     page_films = films[start:end]
 
     if not page_films:
+        return None, None
+
+    return f"Сторінка {page}", build_films_keyboard(page_films, page, show_nav)
+
+@async_log_function_call
+async def send_films_page(chat, films, page):
+    text, keyboard = build_films_page(films, page)
+
+    if text is None:
         await chat.answer("Більше немає фільмів(обмеження API або фільми за параметром закінчилися).")
         await chat.answer("Використовуйте /search або /search_by_genre для пошуку фільмів.")
         return
 
-    keyboard = build_films_keyboard(page_films, page)
-    await chat.answer(f"Сторінка {page}", reply_markup=keyboard)
+    await chat.answer(text, reply_markup=keyboard)
+
+def genre_sources(genre: str) -> list[dict]:
+    # Фільми і серіали запитуються окремо, щоб перша сторінка з'явилась з найшвидшою відповіддю
+    return [
+        {"types": title_type, "genres": genre, "sortBy": "SORT_BY_POPULARITY"}
+        for title_type in ("MOVIE", "TV_SERIES")
+    ]
+
+async def fetch_titles(session: aiohttp.ClientSession, params: dict) -> list[dict]:
+    async with session.get(API_URL, params=params) as resp:
+        data = await resp.json()
+    return data.get("titles", [])
+
+def merge_titles(results: list[list[dict] | None]) -> list[dict]:
+    # Порядок джерел задає ранжування, дублікати за id відкидаються
+    merged = []
+    seen = set()
+    for titles in results:
+        for film in titles or []:
+            fid = get_film_id(film)
+            if fid is None or fid in seen:
+                continue
+            seen.add(fid)
+            merged.append(film)
+    return merged
+
+# Потокова видача першої сторінки з кількох джерел
+@async_log_function_call
+async def stream_films_page(chat, state: FSMContext, sources: list[dict]) -> list[dict]:
+    results = [None] * len(sources)
+    errors = []
+    films = []
+    page_message = None
+    shown = None
+
+    async with aiohttp.ClientSession() as session:
+        tasks = {asyncio.create_task(fetch_titles(session, params)): i for i, params in enumerate(sources)}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    i = tasks[task]
+                    try:
+                        results[i] = task.result()
+                    except Exception as e:
+                        logging.error(f"Помилка при завантаженні джерела {sources[i]}: {e}", exc_info=True)
+                        errors.append(e)
+                        results[i] = []
+
+                # Якщо не відповіло жодне джерело, помилку обробляє викликач
+                if len(errors) == len(sources):
+                    raise errors[-1]
+
+                films = merge_titles(results)
+                final = not pending
+
+                # Чекаємо, поки набереться повна сторінка або не відповіли всі джерела
+                if not films or (len(films) < ITEMS_PER_PAGE and not final):
+                    continue
+
+                # Навігація з'являється лише після злиття всіх джерел, щоб наступні сторінки не зсувались
+                text, keyboard = build_films_page(films, 1, show_nav=final)
+                rendered = ([get_film_id(film) for film in films[:ITEMS_PER_PAGE]], final)
+                if rendered == shown:
+                    continue
+
+                if page_message is None:
+                    page_message = await chat.answer(text, reply_markup=keyboard)
+                else:
+                    try:
+                        await page_message.edit_reply_markup(reply_markup=keyboard)
+                    except Exception as e:
+                        logging.error(f"Помилка при оновленні першої сторінки: {e}", exc_info=True)
+                shown = rendered
+        finally:
+            for task in pending:
+                task.cancel()
+
+    await state.update_data(items=films, page=1)
+    return films
 
 @dp.callback_query(lambda c: c.data.startswith("page_"))
 @async_log_function_call
@@ -352,15 +412,19 @@ async def toggle_favorite(callback: CallbackQuery):
 
         exists = any(f['id'] == film_id for f in favorites)
 
+        # Читання і запис без await між ними, щоб паралельні тогли не затирали один одного
         if exists:
             favorites = [f for f in favorites if f['id'] != film_id]
-            await callback.answer("❌ Вилучено з обраного")
         else:
             favorites.append({"id": film_id, "title": title})
-            await callback.answer("⭐️ Додано в обране")
 
         save_favorites(user, favorites)
 
+        if exists:
+            await callback.answer("❌ Вилучено з обраного")
+        else:
+            await callback.answer("⭐️ Додано в обране")
+
         # Оновлюємо кнопку у тому ж повідомленні
         if exists:
             new_text = "⭐️ Додати в обране"
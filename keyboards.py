@@ -1,6 +1,9 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
-def build_films_keyboard(films: list[dict], page: int) -> InlineKeyboardMarkup:
+def get_film_id(film: dict) -> str | None:
+    return film.get("id") or film.get("tconst")
+
+def build_films_keyboard(films: list[dict], page: int, show_nav: bool = True) -> InlineKeyboardMarkup:
     buttons = []
     for film in films:
         title = (
@@ -10,10 +13,13 @@ def build_films_keyboard(films: list[dict], page: int) -> InlineKeyboardMarkup:
             or "Без назви"
         )[:30]
 
-        fid = film.get("id") or film.get("tconst")
+        fid = get_film_id(film)
         if fid:
             buttons.append([InlineKeyboardButton(text=title, callback_data=f"film_{fid}")])
 
+    if not show_nav:
+        return InlineKeyboardMarkup(inline_keyboard=buttons)
+
     nav = []
     if page > 1:
         nav.append(InlineKeyboardButton(text="⬅️ Попередня", callback_data="page_" + str(page - 1)))
@@ -0,0 +1,73 @@
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import CallbackQuery
+
+
+class CallbackThrottleMiddleware(BaseMiddleware):
+    """
+    Обмежує паралельну обробку натискань inline-кнопок.
+
+    Повторне натискання тієї ж кнопки, поки попереднє ще обробляється,
+    приєднується до вже запущеної задачі. Якщо в користувача вже виконується
+    max_per_user обробників, нове натискання одразу відхиляється через
+    callback.answer, а не ставиться в чергу.
+    """
+
+    def __init__(self, max_per_user: int = 2):
+        self.max_per_user = max_per_user
+        self._in_flight: dict[tuple[int, str], asyncio.Task] = {}
+        self._user_counts: defaultdict[int, int] = defaultdict(int)
+
+    async def __call__(
+        self,
+        handler: Callable[[CallbackQuery, dict[str, Any]], Awaitable[Any]],
+        event: CallbackQuery,
+        data: dict[str, Any],
+    ) -> Any:
+        user_id = event.from_user.id
+        key = (user_id, event.data)
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            # Дублікат: відповідаємо одразу, результат дасть вже запущена задача
+            await self._answer_quietly(event)
+            try:
+                return await asyncio.shield(task)
+            except Exception:
+                # Помилку вже залогує власник задачі
+                return None
+
+        if self._user_counts[user_id] >= self.max_per_user:
+            logging.info(f"Відхилено натискання '{event.data}' від {user_id}: забагато активних запитів")
+            await self._answer_quietly(event, "Зачекайте, попередній запит ще обробляється")
+            return None
+
+        task = asyncio.ensure_future(handler(event, data))
+        self._in_flight[key] = task
+        self._user_counts[user_id] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if task.done():
+                self._release(key)
+            else:
+                task.add_done_callback(lambda _: self._release(key))
+
+    @staticmethod
+    async def _answer_quietly(event: CallbackQuery, text: str | None = None):
+        # Відкинуте натискання не повинно кидати виняток у диспетчер
+        try:
+            await event.answer(text)
+        except Exception as e:
+            logging.warning(f"Не вдалося відповісти на callback '{event.data}': {e}")
+
+    def _release(self, key: tuple[int, str]):
+        self._in_flight.pop(key, None)
+        user_id = key[0]
+        self._user_counts[user_id] -= 1
+        if self._user_counts[user_id] <= 0:
+            del self._user_counts[user_id]